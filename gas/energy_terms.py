@@ -7,6 +7,11 @@ from abc import ABC, abstractmethod
 class EnergyTerm(ABC):
     """Base class for geometric energy terms"""
     
+    # False if compute() depends only on the neighbor set (not on x or
+    # neighbor order); the solver then caches values per neighborhood
+    # and skips the gradient, which is identically zero.
+    uses_position = True
+    
     @abstractmethod
     def compute(self, x: np.ndarray, neighbors: np.ndarray) -> float:
         """Calculate energy for state x given neighborhood"""
@@ -25,11 +30,17 @@ class EnergyTerm(ABC):
             grad[i] = (self.compute(x_plus, neighbors) - 
                       self.compute(x_minus, neighbors)) / (2 * eps)
         return grad
+    
+    def value_and_gradient(self, x: np.ndarray, neighbors: np.ndarray):
+        """(compute, gradient) at x; override to share work between them"""
+        return self.compute(x, neighbors), self.gradient(x, neighbors)
 
 
 class OctahedralEnergy(EnergyTerm):
     """Spectral octahedral term: λ₁(G - I)"""
     
+    uses_position = False
+    
     def compute(self, x: np.ndarray, neighbors: np.ndarray) -> float:
         # Normalize neighbors to unit vectors
         norms = np.linalg.norm(neighbors, axis=1, keepdims=True)
@@ -48,6 +59,8 @@ class OctahedralEnergy(EnergyTerm):
 class TetrahedralEnergy(EnergyTerm):
     """Spectral tetrahedral term: |λ_min(G) + 1/3|"""
     
+    uses_position = False
+    
     def compute(self, x: np.ndarray, neighbors: np.ndarray) -> float:
         norms = np.linalg.norm(neighbors, axis=1, keepdims=True)
         unit_neighbors = neighbors / (norms + 1e-10)
@@ -62,6 +75,8 @@ class TetrahedralEnergy(EnergyTerm):
 class GoldenEnergy(EnergyTerm):
     """φ-ratio alignment energy"""
     
+    uses_position = False
+    
     def compute(self, x: np.ndarray, neighbors: np.ndarray) -> float:
         phi = (1 + np.sqrt(5)) / 2
         
@@ -77,3 +92,118 @@ class GoldenEnergy(EnergyTerm):
         
         # Use median to be robust to outliers
         return np.median(deviation)
+
+
+class SoftSpectralEnergy(EnergyTerm):
+    """Base for smooth soft-neighborhood spectral terms
+    
+    Instead of the hard k-NN set, every one of the 240 roots contributes
+    with softmax kernel weight w_i(x) ∝ exp(-‖x - r_i‖²/T). The spectra
+    are taken from the weighted moment matrix
+    
+        C(x) = k · Σᵢ wᵢ(x) uᵢuᵢᵀ      (uᵢ = rᵢ/‖rᵢ‖)
+    
+    whose nonzero eigenvalues match those of the k-neighbor Gram matrix
+    when the weights are uniform over k roots. C is 8×8, so a term costs
+    one small eigendecomposition, and its gradient is analytic:
+    
+        ∂λ/∂x = k · Σᵢ wᵢ sᵢ (gᵢ - ḡ),   sᵢ = (vᵀuᵢ)²,  gᵢ = -2(x - rᵢ)/T
+    
+    The `neighbors` argument is ignored. The solver requires the
+    kernel temperature and k to match GASParams.soft_temperature and
+    k_neighbors, so the terms and the smooth ρ_coset share one kernel.
+    """
+    
+    def __init__(self, lattice: 'E8Lattice', temperature: float = 0.5,
+                 k: int = 24):
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        self.roots = lattice.all_roots
+        self.units = self.roots / np.linalg.norm(self.roots, axis=1,
+                                                 keepdims=True)
+        self.temperature = temperature
+        self.k = k
+    
+    def _spectrum(self, x: np.ndarray):
+        """Kernel weights, ascending eigenpairs of C(x), kernel gradients"""
+        sq_dist = np.sum((x - self.roots) ** 2, axis=1)
+        w = np.exp(-(sq_dist - sq_dist.min()) / self.temperature)
+        w /= w.sum()
+        
+        C = self.k * (self.units.T * w) @ self.units
+        eigenvalues, eigenvectors = np.linalg.eigh(C)
+        
+        g = -2 * (x - self.roots) / self.temperature
+        g_centered = g - w @ g
+        return w, eigenvalues, eigenvectors, g_centered
+    
+    def _eigenvalue_gradients(self, w, eigenvectors, g_centered):
+        """∂λⱼ/∂x for all j, shape (8 eigenvalues, 8 coordinates)"""
+        s = (self.units @ eigenvectors) ** 2              # (240, 8)
+        return self.k * (s * w[:, None]).T @ g_centered
+    
+    def compute(self, x: np.ndarray, neighbors: np.ndarray) -> float:
+        _, eigenvalues, _, _ = self._spectrum(x)
+        return self._energy(eigenvalues)[0]
+    
+    def gradient(self, x: np.ndarray, neighbors: np.ndarray,
+                 eps: float = 1e-3) -> np.ndarray:
+        """Analytic gradient (eps unused)"""
+        return self.value_and_gradient(x, neighbors)[1]
+    
+    def value_and_gradient(self, x: np.ndarray, neighbors: np.ndarray):
+        """Energy and analytic gradient from a single eigendecomposition"""
+        w, eigenvalues, eigenvectors, g_centered = self._spectrum(x)
+        value, dE_dlambda = self._energy(eigenvalues)
+        return value, dE_dlambda @ self._eigenvalue_gradients(
+            w, eigenvectors, g_centered)
+    
+    @abstractmethod
+    def _energy(self, eigenvalues: np.ndarray):
+        """Energy and its derivative w.r.t. each (ascending) eigenvalue"""
+        pass
+
+
+class SoftOctahedralEnergy(SoftSpectralEnergy):
+    """Smooth octahedral term: max |λ(C) - 1|"""
+    
+    def _energy(self, eigenvalues):
+        deviation = eigenvalues - 1
+        j = np.argmax(np.abs(deviation))
+        dE = np.zeros(8)
+        dE[j] = np.sign(deviation[j])
+        return np.abs(deviation[j]), dE
+
+
+class SoftTetrahedralEnergy(SoftSpectralEnergy):
+    """Smooth tetrahedral term: |λ_min(C) + 1/3|"""
+    
+    def _energy(self, eigenvalues):
+        value = eigenvalues[0] + 1/3
+        dE = np.zeros(8)
+        dE[0] = np.sign(value)
+        return np.abs(value), dE
+
+
+class SoftGoldenEnergy(SoftSpectralEnergy):
+    """Smooth φ-ratio term: |λ₁(C)/λ₂(C) - φ| over the two leading modes"""
+    
+    def _energy(self, eigenvalues):
+        phi = (1 + np.sqrt(5)) / 2
+        lam_1, lam_2 = eigenvalues[-1], eigenvalues[-2] + 1e-10
+        value = lam_1 / lam_2 - phi
+        dE = np.zeros(8)
+        dE[-1] = np.sign(value) / lam_2
+        dE[-2] = -np.sign(value) * lam_1 / lam_2**2
+        return np.abs(value), dE
+
+
+def create_soft_energy_suite(lattice: 'E8Lattice',
+                             temperature: float = 0.5,
+                             k: int = 24) -> list:
+    """[oct, tet, phi] soft terms, ordered to match the solver's weights"""
+    return [
+        SoftOctahedralEnergy(lattice, temperature, k),
+        SoftTetrahedralEnergy(lattice, temperature, k),
+        SoftGoldenEnergy(lattice, temperature, k),
+    ]
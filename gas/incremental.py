@@ -0,0 +1,112 @@
+"""
+Warm-Started Incremental Re-Optimization
+
+For streaming workloads where the decoded problem (W, cost model)
+drifts slowly between requests. The first solve is a normal cold run;
+every later solve seeds a small batch of chains from the previous
+elite solutions plus tangent perturbations and runs a short, cooler
+annealing schedule that resumes alpha_t where the previous solve left
+off. Seeds and chains draw from the instance's own RandomState, so a
+sequence of solves is reproducible. The solver's neighborhood energy
+cache persists across calls, and the decoder is warm-started from the previous y, so
+it never needs to refactor WᵀW after W drifts.
+"""
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .solver import GeometricAnnealingSolver, GASState
+
+
+@dataclass
+class IncrementalResult:
+    """Outcome of one incremental solve"""
+    state: GASState
+    y: Optional[np.ndarray] = None   # decoded N-space solution, if any
+    warm: bool = False               # True if seeded from a previous solve
+
+
+class IncrementalSolver:
+    """Re-solve a drifting problem as a short refinement of the last one"""
+
+    def __init__(self,
+                 solver: GeometricAnnealingSolver,
+                 decoder: Optional['ProximalGeometricDecoder'] = None,
+                 n_seeds: int = 4,
+                 perturbation: float = 0.05,
+                 temperature_scale: float = 0.25,
+                 refine_iters: Optional[int] = None,
+                 n_elite: int = 4,
+                 seed: Optional[int] = None):
+        self.solver = solver
+        self.decoder = decoder
+        self.n_seeds = n_seeds
+        self.perturbation = perturbation
+        self.temperature_scale = temperature_scale
+        self.refine_iters = (refine_iters if refine_iters is not None
+                             else max(1, solver.params.max_iters // 5))
+        self.n_elite = n_elite
+        self.rng = np.random.RandomState(seed)
+
+        self.elite: List[np.ndarray] = []
+        self.y_prev: Optional[np.ndarray] = None
+        self.schedule_offset = 0   # iterations run by previous solves
+
+    def reset(self):
+        """Forget previous solutions; the next solve starts cold"""
+        self.elite = []
+        self.y_prev = None
+        self.schedule_offset = 0
+
+    def _chain_rng(self) -> np.random.RandomState:
+        return np.random.RandomState(self.rng.randint(2**31))
+
+    def _seeds(self) -> np.ndarray:
+        """Previous elites (best first, unperturbed) plus perturbed copies"""
+        seeds = [self.elite[0]]
+        for j in range(1, self.n_seeds):
+            base = self.elite[j % len(self.elite)]
+            noise = self.rng.randn(8)
+            noise -= (noise @ base) / (base @ base) * base   # tangent at base
+            x = base + self.perturbation * noise
+            seeds.append(x / np.linalg.norm(x) * np.sqrt(2))
+        return np.stack(seeds)
+
+    def solve(self,
+              W: Optional[np.ndarray] = None,
+              cost_model: Optional[Callable] = None,
+              max_decode_iters: int = 500) -> IncrementalResult:
+        """Solve the current problem, warm-started from the previous one
+
+        W: current projection matrix, passed to the decoder when it
+        changes.
+        """
+        warm = bool(self.elite)
+        if warm:
+            states = self.solver.optimize_batch(
+                self._seeds(),
+                max_iters=self.refine_iters,
+                temperature_scale=self.temperature_scale,
+                rngs=[self._chain_rng() for _ in range(self.n_seeds)],
+                schedule_offset=self.schedule_offset)
+        else:
+            states = [self.solver.optimize(rng=self._chain_rng())]
+
+        states.sort(key=lambda state: state.energy)
+        self.elite = [state.x for state in states[:self.n_elite]]
+        best = states[0]
+        self.schedule_offset = best.schedule_offset + best.iteration
+
+        y = None
+        if self.decoder is not None:
+            if W is not None and not np.array_equal(W, self.decoder.W):
+                self.decoder.set_W(W)
+            y_init = self.y_prev
+            if y_init is not None and len(y_init) != self.decoder.W.shape[0]:
+                y_init = None
+            y = self.decoder.decode(best.x, cost_model,
+                                    max_iters=max_decode_iters,
+                                    y_init=y_init)
+            self.y_prev = y
+
+        return IncrementalResult(state=best, y=y, warm=warm)
@@ -50,5 +50,27 @@ class E8Lattice:
         return self.all_roots[indices], indices
     
     def coset_density(self, indices: np.ndarray) -> float:
-        """Calculate ρ_coset for neighborhood"""
-        return np.mean(self.is_coset[indices])
+        """Calculate ρ_coset for neighborhood (batched over leading axes)"""
+        return np.mean(self.is_coset[indices], axis=-1)
+    
+    def soft_weights(self, x: np.ndarray, temperature: float) -> np.ndarray:
+        """Softmax kernel over all 240 roots: w_i ∝ exp(-‖x - r_i‖²/T)
+        
+        x may carry leading batch axes; weights are over the last axis.
+        """
+        sq_dist = np.sum((x[..., None, :] - self.all_roots) ** 2, axis=-1)
+        logits = -(sq_dist - sq_dist.min(axis=-1, keepdims=True)) / temperature
+        w = np.exp(logits)
+        return w / w.sum(axis=-1, keepdims=True)
+    
+    def soft_coset_density(self, x: np.ndarray, temperature: float) -> float:
+        """Smooth ρ_coset: kernel-weighted fraction of coset roots"""
+        return self.soft_weights(x, temperature) @ self.is_coset.astype(float)
+    
+    def soft_coset_density_gradient(self, x: np.ndarray,
+                                    temperature: float) -> np.ndarray:
+        """∂ρ_soft/∂x = Σᵢ wᵢ cᵢ (gᵢ - ḡ),  gᵢ = -2(x - rᵢ)/T"""
+        w = self.soft_weights(x, temperature)
+        g = -2 * (x - self.all_roots) / temperature
+        g_centered = g - w @ g
+        return (w * self.is_coset) @ g_centered
@@ -0,0 +1,87 @@
+"""
+Adaptive Proposal Distribution for GAS
+
+Replaces the move drift + σ_t·N(0, I) with s·(drift + σ_t·L·z),
+where drift is the gradient and φ-folding step and log s is tuned by
+Robbins-Monro toward a target Metropolis acceptance rate. Optionally
+LLᵀ is an online estimate of the chain covariance (normalized to
+trace 8, so σ_t keeps its meaning); otherwise L = I.
+The noise is projected onto the tangent space of S⁷ at x, since any
+radial component is discarded by the renormalization anyway.
+"""
+import numpy as np
+
+
+class AdaptiveProposal:
+    """Step-size (Robbins-Monro) and optional covariance (Haario) adaptation
+
+    The default target is well below the 0.234 random-walk optimum: GAS
+    runs near-greedy at its low temperatures and converges once its
+    energy stalls, so a chain that keeps accepting small moves never
+    stops. Covariance adaptation is off by default since the chain's
+    positions trace its descent path rather than the local landscape.
+    """
+
+    def __init__(self,
+                 target_accept: float = 0.07,
+                 adapt_covariance: bool = False,
+                 decay: float = 0.6,
+                 cov_floor: float = 1e-3,
+                 max_log_scale: float = 5.0):
+        if not 0.0 < target_accept < 1.0:
+            raise ValueError("target_accept must be in (0, 1)")
+        if not 0.5 < decay <= 1.0:
+            raise ValueError("decay must be in (0.5, 1]")
+        self.target_accept = target_accept
+        self.adapt_covariance = adapt_covariance
+        self.decay = decay
+        self.cov_floor = cov_floor
+        self.max_log_scale = max_log_scale
+
+        self.n = 0
+        self.log_scale = 0.0
+        self.mean = np.zeros(8)
+        self.cov = np.eye(8)
+        self._chol = np.eye(8)
+
+    def move(self, x: np.ndarray, drift: np.ndarray, sigma_t: float,
+             random=np.random) -> np.ndarray:
+        """Scaled step s·(drift + σ_t·L·z) from x (random: RNG source)
+
+        The scale acts on the whole move, not only on the noise, since
+        most rejections come from an overlong deterministic drift.
+        """
+        z = self._chol @ random.randn(8)
+
+        # Tangent-space projection at x
+        x_hat = x / (np.linalg.norm(x) + 1e-10)
+        z -= (z @ x_hat) * x_hat
+
+        return np.exp(self.log_scale) * (drift + sigma_t * z)
+
+    def update(self, x: np.ndarray, accepted: bool):
+        """Adapt after a Metropolis decision; x is the chain's new position"""
+        self.n += 1
+        gain = 1.0 / (self.n + 1) ** self.decay
+
+        # Step size: drive the acceptance rate toward target
+        self.log_scale += gain * (float(accepted) - self.target_accept)
+        self.log_scale = float(np.clip(self.log_scale,
+                                       -self.max_log_scale,
+                                       self.max_log_scale))
+
+        if not self.adapt_covariance:
+            return
+
+        # Shape: stochastic-approximation estimate of the chain covariance
+        delta = x - self.mean
+        self.mean += gain * delta
+        self.cov += gain * (np.outer(delta, delta) - self.cov)
+
+        # Normalize to trace 8 so σ_t still sets the overall step length
+        shape = self.cov * (8.0 / (np.trace(self.cov) + 1e-10))
+        shape += self.cov_floor * np.eye(8)
+        try:
+            self._chol = np.linalg.cholesky(shape)
+        except np.linalg.LinAlgError:
+            self._chol = np.eye(8)
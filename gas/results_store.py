@@ -0,0 +1,290 @@
+"""
+Columnar On-Disk Results Store for Multi-Run Campaigns
+
+Layout:
+    root/schema.json              column name -> (dtype, per-row shape)
+    root/shard-<id>/<column>.bin  raw little-endian column data
+
+Every writer appends to its own shard, so concurrent workers never
+share a file. Readers memory-map one column at a time; a row counts
+only once every column of its shard holds it, so a reader never sees
+a half-written row.
+
+The schema may grow (e.g. when GASParams gains a field): new columns
+are added to schema.json, and shards written before a column existed
+read it as NaN (float) or zero (int/bool).
+"""
+import json
+import os
+import socket
+import uuid
+import numpy as np
+from dataclasses import fields
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .solver import GASParams, GASState
+
+
+def _build_schema() -> Dict[str, Tuple[str, Tuple[int, ...]]]:
+    schema = {
+        "x": ("<f8", (8,)),
+        "energy": ("<f8", ()),
+        "rho_coset": ("<f8", ()),
+        "iteration": ("<i8", ()),
+        "converged": ("|b1", ()),
+        "acceptance_rate": ("<f8", ()),
+        "n_energy_evals": ("<i8", ()),
+        "seed": ("<i8", ()),
+    }
+    # Every GASParams field as float64 (None -> NaN)
+    for f in fields(GASParams):
+        schema[f"param_{f.name}"] = ("<f8", ())
+    return schema
+
+
+SCHEMA = _build_schema()
+
+
+class ShardWriter:
+    """Appends runs to one shard; use one writer per process/worker"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._files = {name: open(os.path.join(directory, f"{name}.bin"), "ab")
+                       for name in SCHEMA}
+
+    def append(self,
+               state: GASState,
+               params: GASParams,
+               seed: int = -1):
+        """Record one finished run"""
+        row = {
+            "x": state.x,
+            "energy": state.energy,
+            "rho_coset": state.rho_coset,
+            "iteration": state.iteration,
+            "converged": state.converged,
+            "acceptance_rate": state.acceptance_rate,
+            "n_energy_evals": state.n_energy_evals,
+            "seed": seed,
+        }
+        for f in fields(GASParams):
+            value = getattr(params, f.name)
+            row[f"param_{f.name}"] = np.nan if value is None else value
+
+        for name, (dtype, shape) in SCHEMA.items():
+            data = np.asarray(row[name], dtype=dtype).reshape(shape)
+            self._files[name].write(data.tobytes())
+        for fh in self._files.values():
+            fh.flush()
+
+    def close(self):
+        for fh in self._files.values():
+            fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResultsStore:
+    """Append-only columnar store of GAS runs with best-k/filter queries"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.schema = self._merge_schema()
+
+    def _merge_schema(self) -> Dict[str, Tuple[str, Tuple[int, ...]]]:
+        """Union of the stored schema and SCHEMA; new columns are added
+
+        Columns no longer in SCHEMA stay readable. A column whose dtype
+        or shape changed is an error.
+        """
+        path = os.path.join(self.root, "schema.json")
+        schema = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                schema = {name: (dtype, tuple(shape))
+                          for name, (dtype, shape) in json.load(fh).items()}
+
+        added = False
+        for name, spec in SCHEMA.items():
+            if name not in schema:
+                schema[name] = spec
+                added = True
+            elif schema[name] != spec:
+                raise ValueError(f"Column {name!r} in results store "
+                                 f"{self.root} has layout {schema[name]}, "
+                                 f"expected {spec}")
+
+        if added:
+            tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({name: [dtype, list(shape)]
+                           for name, (dtype, shape) in schema.items()},
+                          fh, indent=2)
+            os.replace(tmp, path)
+        return schema
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def writer(self) -> ShardWriter:
+        """New shard writer (unique per call; safe across processes)"""
+        shard_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        return ShardWriter(os.path.join(self.root, f"shard-{shard_id}"))
+
+    def append(self, state: GASState, params: GASParams, seed: int = -1):
+        """One-off append in its own shard (prefer writer() for many runs)"""
+        with self.writer() as w:
+            w.append(state, params, seed)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _shards(self) -> List[Tuple[str, int]]:
+        """(directory, complete row count) for every shard, sorted"""
+        shards = []
+        for entry in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, entry)
+            if not (entry.startswith("shard-") and os.path.isdir(directory)):
+                continue
+            # Columns the shard predates are absent, not incomplete
+            present = [name for name in self.schema
+                       if os.path.exists(self._path(directory, name))]
+            n = min((self._file_rows(directory, name) for name in present),
+                    default=0)
+            if n > 0:
+                shards.append((directory, n))
+        return shards
+
+    @staticmethod
+    def _path(directory: str, name: str) -> str:
+        return os.path.join(directory, f"{name}.bin")
+
+    def _row_bytes(self, name: str) -> int:
+        dtype, shape = self.schema[name]
+        return np.dtype(dtype).itemsize * int(np.prod(shape, dtype=int))
+
+    def _file_rows(self, directory: str, name: str) -> int:
+        return os.path.getsize(self._path(directory, name)) // self._row_bytes(name)
+
+    def _memmap(self, directory: str, name: str, n: int) -> np.ndarray:
+        """Column of a shard; filled with NaN/zero if the shard predates it"""
+        dtype, shape = self.schema[name]
+        path = self._path(directory, name)
+        if not os.path.exists(path):
+            fill = np.nan if np.dtype(dtype).kind == "f" else 0
+            return np.full((n,) + tuple(shape), fill, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r",
+                         shape=(n,) + tuple(shape))
+
+    def __len__(self) -> int:
+        return sum(n for _, n in self._shards())
+
+    def column(self, name: str) -> np.ndarray:
+        """Load a single column across all shards"""
+        if name not in self.schema:
+            raise KeyError(name)
+        dtype, shape = self.schema[name]
+        parts = [np.asarray(self._memmap(d, name, n)) for d, n in self._shards()]
+        if not parts:
+            return np.empty((0,) + tuple(shape), dtype=dtype)
+        return np.concatenate(parts)
+
+    def _gather(self,
+                shards: List[Tuple[str, int]],
+                selection: List[np.ndarray],
+                columns: Optional[Sequence[str]]) -> Dict[str, np.ndarray]:
+        """Read the selected rows of each shard into a column dict"""
+        columns = list(columns) if columns is not None else list(self.schema)
+        table = {}
+        for name in columns:
+            dtype, shape = self.schema[name]
+            parts = [np.asarray(self._memmap(d, name, n)[rows])
+                     for (d, n), rows in zip(shards, selection) if len(rows)]
+            table[name] = (np.concatenate(parts) if parts else
+                           np.empty((0,) + tuple(shape), dtype=dtype))
+        return table
+
+    def best_k(self,
+               k: int,
+               by: str = "energy",
+               largest: bool = False,
+               columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """The k best runs by a scalar column (lowest energy by default)"""
+        if self.schema[by][1] != ():
+            raise ValueError(f"Column {by!r} is not scalar")
+        shards = self._shards()
+        sign = -1.0 if largest else 1.0
+
+        # Per-shard top-k on the key column only, then a global merge
+        candidates = []
+        for shard_no, (d, n) in enumerate(shards):
+            key = sign * np.asarray(self._memmap(d, by, n), dtype=float)
+            rows = (np.argpartition(key, k - 1)[:k] if n > k
+                    else np.arange(n))
+            candidates.extend((key[r], shard_no, r) for r in rows)
+        candidates.sort(key=lambda c: c[0])
+        candidates = candidates[:k]
+
+        # Gather shard by shard, then restore the global order
+        selection = [np.array([r for _, s, r in candidates if s == i],
+                              dtype=int)
+                     for i in range(len(shards))]
+        wanted = list(columns) if columns is not None else list(self.schema)
+        table = self._gather(shards, selection, set(wanted) | {by})
+        order = np.argsort(sign * table[by].astype(float), kind="stable")
+        return {name: table[name][order] for name in wanted}
+
+    def query(self,
+              rho_min: Optional[float] = None,
+              rho_max: Optional[float] = None,
+              converged: Optional[bool] = None,
+              energy_max: Optional[float] = None,
+              columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Runs matching all given filters, reading only the filter columns
+        plus the requested output columns"""
+        shards = self._shards()
+        selection = []
+        for d, n in shards:
+            mask = np.ones(n, dtype=bool)
+            if rho_min is not None or rho_max is not None:
+                rho = self._memmap(d, "rho_coset", n)
+                if rho_min is not None:
+                    mask &= rho >= rho_min
+                if rho_max is not None:
+                    mask &= rho <= rho_max
+            if converged is not None:
+                mask &= self._memmap(d, "converged", n) == converged
+            if energy_max is not None:
+                mask &= self._memmap(d, "energy", n) <= energy_max
+            selection.append(np.flatnonzero(mask))
+        return self._gather(shards, selection, columns)
+
+
+def params_from_row(table: Dict[str, np.ndarray], i: int) -> GASParams:
+    """Rebuild the GASParams of row i from a query/best_k result
+
+    Fields without a column in the table, or stored as NaN (None, or a
+    column the run predates), take their GASParams default.
+    """
+    values = {}
+    for f in fields(GASParams):
+        column = table.get(f"param_{f.name}")
+        if column is None or np.isnan(float(column[i])):
+            continue
+        value = float(column[i])
+        if f.type in (int, "int"):
+            values[f.name] = int(value)
+        elif f.type in (bool, "bool"):
+            values[f.name] = bool(value)
+        else:
+            values[f.name] = value
+    return GASParams(**values)
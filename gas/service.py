@@ -0,0 +1,446 @@
+"""
+Local Asyncio Optimization Service
+
+Serves optimize/decode requests from many clients in one process.
+Requests that arrive within a short batching window are coalesced
+into a single lockstep batch of GAS chains (optimize_batch) and run
+in an executor, so the event loop keeps accepting work while chains
+are stepping. Each request is answered as soon as its own chain
+stops; decode requests run as a separate executor task.
+
+Wire protocol: newline-delimited JSON over a Unix socket or a
+localhost TCP port. One request per line:
+
+    {"id": 1, "op": "optimize", "x_init": [...], "max_iters": 500,
+     "seed": 7, "deadline": 2.0}
+    {"id": 2, "op": "decode", "W": [[...], ...], "x": [...]}
+    {"id": 3, "op": "stats"}
+
+Each response echoes "id" and carries either "result" or "error".
+"deadline" is in seconds from receipt.
+"""
+import asyncio
+import json
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .energy_terms import EnergyTerm
+from .solver import GeometricAnnealingSolver, GASParams, GASState
+
+
+@dataclass
+class _Job:
+    """A queued request waiting to be batched"""
+    op: str
+    payload: Dict[str, Any]
+    future: asyncio.Future
+    submitted: float
+    deadline: Optional[float] = None   # absolute, time.monotonic()
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def abandoned(self) -> bool:
+        return self.future.done() or self.expired()
+
+
+@dataclass
+class ServiceStats:
+    """Counters and a rolling latency window"""
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    batches: int = 0
+    batched_jobs: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=10000))
+
+
+class OptimizationService:
+    """Coalesces concurrent optimize/decode requests into batched runs"""
+
+    def __init__(self,
+                 lattice: 'E8Lattice',
+                 energy_terms: List[EnergyTerm],
+                 params: Optional[GASParams] = None,
+                 max_batch: int = 32,
+                 batch_window: float = 0.005,
+                 max_concurrent_batches: int = 2,
+                 executor: Optional[Executor] = None):
+        self.lattice = lattice
+        self.energy_terms = energy_terms
+        self.params = params or GASParams()
+        self.solver = GeometricAnnealingSolver(lattice, energy_terms,
+                                               self.params)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        # Each batch may use two threads: its GAS chains and its decodes
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=2 * max_concurrent_batches)
+        self._owns_executor = executor is None
+        self.max_concurrent_batches = max_concurrent_batches
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()
+        self._in_flight = 0
+        self._servers: List[asyncio.AbstractServer] = []
+        self.stats = ServiceStats()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        if self._dispatcher is None:
+            self._queue = asyncio.Queue()
+            self._batch_slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            if not job.future.done():
+                job.future.cancel()
+
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    async def serve_unix(self, path: str):
+        """Listen on a Unix domain socket"""
+        await self.start()
+        server = await asyncio.start_unix_server(self._handle_client,
+                                                 path=path)
+        self._servers.append(server)
+        return server
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 0):
+        """Listen on a localhost TCP port (port=0 picks a free one)"""
+        await self.start()
+        server = await asyncio.start_server(self._handle_client,
+                                            host=host, port=port)
+        self._servers.append(server)
+        return server
+
+    # ------------------------------------------------------------------
+    # Request API
+    # ------------------------------------------------------------------
+
+    async def submit(self,
+                     op: str,
+                     payload: Optional[Dict[str, Any]] = None,
+                     deadline: Optional[float] = None) -> Any:
+        """Queue a request and wait for its result
+
+        deadline: seconds from now; raises asyncio.TimeoutError when
+        exceeded. Cancelling the awaiting task drops the request from
+        its batch.
+        """
+        if op not in ("optimize", "decode"):
+            raise ValueError(f"Unknown op: {op!r}")
+        await self.start()
+
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        job = _Job(op=op,
+                   payload=payload or {},
+                   future=loop.create_future(),
+                   submitted=now,
+                   deadline=None if deadline is None else now + deadline)
+        await self._queue.put(job)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.future),
+                                          timeout=deadline)
+        except asyncio.TimeoutError:
+            self.stats.timed_out += 1
+            job.future.cancel()
+            raise
+        except asyncio.CancelledError:
+            self.stats.cancelled += 1
+            job.future.cancel()
+            raise
+
+    def report(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and latency percentiles (s)"""
+        latencies = np.array(self.stats.latencies)
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        else:
+            p50 = p95 = p99 = None
+        batches = self.stats.batches
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "in_flight": self._in_flight,
+            "completed": self.stats.completed,
+            "failed": self.stats.failed,
+            "timed_out": self.stats.timed_out,
+            "cancelled": self.stats.cancelled,
+            "batches": batches,
+            "mean_batch_size": (self.stats.batched_jobs / batches
+                                if batches else 0.0),
+            "latency_p50": p50,
+            "latency_p95": p95,
+            "latency_p99": p99,
+        }
+
+    # ------------------------------------------------------------------
+    # Batching
+    # ------------------------------------------------------------------
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            window_end = loop.time() + self.batch_window
+
+            while len(batch) < self.max_batch:
+                remaining = window_end - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(),
+                                                        timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [job for job in batch if not job.abandoned()]
+            if not batch:
+                continue
+
+            await self._batch_slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[_Job]):
+        """Run the batch's optimize and decode jobs as separate executor
+        tasks; each job's future resolves as soon as that job is done"""
+        loop = asyncio.get_running_loop()
+        self._in_flight += len(batch)
+        for job in batch:
+            job.future.add_done_callback(self._job_left)
+        self.stats.batches += 1
+        self.stats.batched_jobs += len(batch)
+
+        def finish(job: _Job, result: Any):
+            # Called from the executor thread
+            if isinstance(result, Exception):
+                loop.call_soon_threadsafe(self._finish, job, None, result)
+            else:
+                loop.call_soon_threadsafe(self._finish, job, result)
+
+        runs = []
+        for op, run in (("optimize", self._run_optimize),
+                        ("decode", self._run_decode)):
+            jobs = [job for job in batch if job.op == op]
+            if jobs:
+                runs.append((jobs, loop.run_in_executor(self.executor, run,
+                                                        jobs, finish)))
+        try:
+            outcomes = await asyncio.gather(*(run for _, run in runs),
+                                            return_exceptions=True)
+            # A run that raised leaves its unfinished jobs failed
+            for (jobs, _), outcome in zip(runs, outcomes):
+                if isinstance(outcome, Exception):
+                    for job in jobs:
+                        self._finish(job, error=outcome)
+        finally:
+            self._batch_slots.release()
+
+    def _job_left(self, future: asyncio.Future):
+        self._in_flight -= 1
+
+    def _finish(self, job: _Job, result: Any = None,
+                error: Optional[Exception] = None):
+        if job.future.done():
+            return
+        if error is not None:
+            self.stats.failed += 1
+            job.future.set_exception(error)
+        else:
+            self.stats.completed += 1
+            self.stats.latencies.append(time.monotonic() - job.submitted)
+            job.future.set_result(result)
+
+    def _parse_optimize(self, payload: Dict[str, Any]):
+        """Validate one optimize request -> (x_init, budget, rng)
+
+        A seeded request gets its own RandomState, used for both the
+        start point and the chain's noise, so equal seeds give equal
+        results regardless of what else shares the batch (unless the
+        params enable surrogate_screening, whose model all chains share).
+        """
+        seed = payload.get("seed")
+        if seed is not None and (isinstance(seed, bool) or
+                                 not isinstance(seed, int) or seed < 0):
+            raise ValueError("seed must be a non-negative integer")
+        rng = None if seed is None else np.random.RandomState(seed)
+
+        x_init = payload.get("x_init")
+        if x_init is None:
+            x_init = (np.random if rng is None else rng).randn(8)
+        x_init = np.asarray(x_init, dtype=float)
+        if x_init.shape != (8,):
+            raise ValueError("x_init must have 8 components")
+        norm = np.linalg.norm(x_init)
+        if not np.all(np.isfinite(x_init)) or norm == 0:
+            raise ValueError("x_init must be finite and nonzero")
+
+        budget = payload.get("max_iters", self.params.max_iters)
+        if isinstance(budget, bool) or not isinstance(budget, int) or budget < 0:
+            raise ValueError("max_iters must be a non-negative integer")
+
+        return x_init / norm * np.sqrt(2), budget, rng
+
+    def _run_optimize(self, jobs: List[_Job],
+                      finish: Callable[[_Job, Any], None]):
+        """Executor side: one lockstep batch of GAS chains
+
+        Invalid requests fail individually and are left out of the batch;
+        every other job is finished as soon as its own chain stops.
+        """
+        valid, x_inits, budgets, rngs = [], [], [], []
+        for job in jobs:
+            try:
+                x_init, budget, rng = self._parse_optimize(job.payload)
+            except (TypeError, ValueError) as exc:
+                finish(job, exc)
+                continue
+            valid.append(job)
+            x_inits.append(x_init)
+            budgets.append(budget)
+            rngs.append(rng)
+
+        if not valid:
+            return
+
+        def stop(i: int, state: GASState) -> bool:
+            return state.iteration >= budgets[i] or valid[i].abandoned()
+
+        def on_done(i: int, state: GASState):
+            # An abandoned job is resolved by submit() (timeout/cancel)
+            if not valid[i].abandoned():
+                finish(valid[i], _state_to_dict(state))
+
+        self.solver.optimize_batch(np.stack(x_inits),
+                                   max_iters=max(budgets),
+                                   stop=stop,
+                                   rngs=rngs,
+                                   on_done=on_done)
+
+    def _run_decode(self, jobs: List[_Job],
+                    finish: Callable[[_Job, Any], None]):
+        """Executor side: decode requests, finished one at a time
+
+        Each request carries its own W, so the decodes are independent
+        L-BFGS solves run one after another (not vectorized); they run
+        as their own executor task, never behind a batch's GAS chains.
+        """
+        from meta_layer.decoder import ProximalGeometricDecoder
+
+        for job in jobs:
+            if job.abandoned():
+                finish(job, asyncio.TimeoutError())
+                continue
+            try:
+                payload = job.payload
+                decoder = ProximalGeometricDecoder(
+                    np.asarray(payload["W"], dtype=float),
+                    self.lattice,
+                    self.energy_terms,
+                    **{k: float(payload[k])
+                       for k in ("lambda_1", "lambda_2", "lambda_3")
+                       if k in payload})
+                y = decoder.decode(np.asarray(payload["x"], dtype=float),
+                                   max_iters=int(payload.get("max_iters",
+                                                             500)))
+                finish(job, {"y": [float(v) for v in y]})
+            except Exception as exc:
+                finish(job, exc)
+
+    # ------------------------------------------------------------------
+    # Wire protocol
+    # ------------------------------------------------------------------
+
+    async def _handle_client(self,
+                             reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        pending = set()
+
+        async def respond(message: Dict[str, Any]):
+            async with write_lock:
+                writer.write((json.dumps(message) + "\n").encode())
+                await writer.drain()
+
+        async def handle(line: bytes):
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get("id")
+                op = request.get("op")
+                if op == "stats":
+                    result = self.report()
+                else:
+                    payload = {k: v for k, v in request.items()
+                               if k not in ("id", "op", "deadline")}
+                    result = await self.submit(op, payload,
+                                               request.get("deadline"))
+                await respond({"id": request_id, "result": result})
+            except asyncio.TimeoutError:
+                await respond({"id": request_id,
+                               "error": "deadline exceeded"})
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                await respond({"id": request_id,
+                               "error": f"{type(exc).__name__}: {exc}"})
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(handle(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        finally:
+            # Client went away: cancel its outstanding requests
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+
+def _state_to_dict(state: GASState) -> Dict[str, Any]:
+    return {
+        "x": [float(v) for v in state.x],
+        "energy": float(state.energy),
+        "rho_coset": float(state.rho_coset),
+        "iteration": int(state.iteration),
+        "converged": bool(state.converged),
+        "acceptance_rate": float(state.acceptance_rate),
+        "n_energy_evals": int(state.n_energy_evals),
+    }
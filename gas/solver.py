@@ -3,8 +3,13 @@ Geometric Annealing Solver (GAS) - Core Algorithm
 """
 import numpy as np
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional, Callable
 
+from .energy_terms import EnergyTerm, SoftSpectralEnergy
+from .proposal import AdaptiveProposal
+from .surrogate import SurrogateModel
+
 @dataclass
 class GASParams:
     """Hyperparameters for GAS"""
@@ -19,6 +24,12 @@ class GASParams:
     tau_E: float = 1e-4        # Energy convergence tolerance
     rho_min: float = 0.6       # Minimum coset density
     tau_phi: float = 0.05      # φ-alignment tolerance
+    adaptive_proposal: bool = False  # Adapt the step size of the whole move
+    target_accept: float = 0.07      # Acceptance rate the adaptation targets
+    adapt_covariance: bool = False   # Also adapt the noise covariance
+    soft_temperature: Optional[float] = None  # Kernel T for smooth ρ_coset
+    energy_cache_size: int = 4096    # Neighborhoods with cached term values
+    surrogate_screening: bool = False  # Delayed acceptance via surrogate
 
 
 @dataclass
@@ -31,6 +42,24 @@ class GASState:
     converged: bool = False
     energy_history: List[float] = field(default_factory=list)
     rho_history: List[float] = field(default_factory=list)
+    n_accepted: int = 0
+    n_energy_evals: int = 0
+    proposal: Optional[AdaptiveProposal] = None
+    temperature_scale: float = 1.0   # Multiplies eta_0 and sigma_0
+    schedule_offset: int = 0         # Iterations already run (for alpha_t)
+    rng: Optional[np.random.RandomState] = None  # Chain-local RNG (None: global)
+    neighbors: Optional[np.ndarray] = None  # k-NN roots of x (None: query)
+    indices: Optional[np.ndarray] = None    # Their root indices
+    
+    @property
+    def random(self):
+        """The chain's random source: its own RandomState or np.random"""
+        return np.random if self.rng is None else self.rng
+    
+    @property
+    def acceptance_rate(self) -> float:
+        """Fraction of Metropolis proposals accepted so far"""
+        return self.n_accepted / max(self.iteration, 1)
 
 
 class GeometricAnnealingSolver:
@@ -43,7 +72,38 @@ class GeometricAnnealingSolver:
         self.lattice = lattice
         self.energy_terms = energy_terms
         self.params = params
+        self._check_soft_terms()
         self.R_phi = self._construct_phi_rotation()
+        
+        # Terms that ignore x depend only on the (unordered) neighbor set,
+        # so their values are cached by sorted root indices. The cache
+        # lives as long as the solver, i.e. across optimize() calls.
+        self._static_terms = [i for i, term in enumerate(energy_terms)
+                              if not term.uses_position]
+        self._static_term_values = lru_cache(
+            maxsize=params.energy_cache_size)(self._neighborhood_term_values)
+        
+        # Shared by all chains of this solver, and kept across calls
+        self.surrogate = None
+        if params.surrogate_screening:
+            self.surrogate = SurrogateModel()
+    
+    def _check_soft_terms(self):
+        """Soft terms must use the same kernel as the smooth ρ_coset"""
+        for term in self.energy_terms:
+            if not isinstance(term, SoftSpectralEnergy):
+                continue
+            if self.params.soft_temperature is None:
+                raise ValueError(
+                    f"{type(term).__name__} needs GASParams.soft_temperature "
+                    f"(got None, i.e. a hard ρ_coset)")
+            if (term.temperature != self.params.soft_temperature or
+                    term.k != self.params.k_neighbors):
+                raise ValueError(
+                    f"{type(term).__name__} has temperature={term.temperature}, "
+                    f"k={term.k}; GASParams has soft_temperature="
+                    f"{self.params.soft_temperature}, "
+                    f"k_neighbors={self.params.k_neighbors}")
     
     def _construct_phi_rotation(self) -> np.ndarray:
         """Construct golden rotation matrix in e₁-e₈ plane"""
@@ -65,16 +125,44 @@ class GeometricAnnealingSolver:
     def _compute_energy(self, 
                        x: np.ndarray, 
                        neighbors: np.ndarray,
-                       rho: float) -> float:
+                       rho: float,
+                       indices: Optional[np.ndarray] = None) -> float:
         """Calculate total weighted energy"""
         weights = self._compute_weights(rho)
+        cached = self._static_values(neighbors, indices)
         
         total = 0.0
-        for term, weight in zip(self.energy_terms, weights):
-            total += weight * term.compute(x, neighbors)
+        for i, (term, weight) in enumerate(zip(self.energy_terms, weights)):
+            value = cached[i] if i in cached else term.compute(x, neighbors)
+            total += weight * value
         
         return total
     
+    def _static_values(self,
+                       neighbors: np.ndarray,
+                       indices: Optional[np.ndarray]) -> dict:
+        """{term index: value} of the x-independent terms (cached by indices)"""
+        if not self._static_terms:
+            return {}
+        if indices is None:
+            return {i: self.energy_terms[i].compute(None, neighbors)
+                    for i in self._static_terms}
+        key = tuple(sorted(int(i) for i in indices))
+        return dict(zip(self._static_terms, self._static_term_values(key)))
+    
+    def _neighborhood_term_values(self, key: tuple) -> tuple:
+        """Values of the x-independent terms for a sorted index tuple"""
+        neighbors = self.lattice.all_roots[list(key)]
+        return tuple(self.energy_terms[i].compute(None, neighbors)
+                     for i in self._static_terms)
+    
+    def _coset_density(self, x: np.ndarray, indices: np.ndarray) -> float:
+        """ρ_coset of the k-NN set, or its smooth kernel version"""
+        if self.params.soft_temperature is not None:
+            return self.lattice.soft_coset_density(
+                x, self.params.soft_temperature)
+        return self.lattice.coset_density(indices)
+    
     def _compute_weights(self, rho: float) -> np.ndarray:
         """Dynamic sigmoid weighting based on coset density"""
         # Rational family (oct, tet): favor low rho
@@ -88,111 +176,375 @@ class GeometricAnnealingSolver:
         # Return weights for [oct, tet, phi, ...] terms
         return np.array([w_rational, w_rational, w_exceptional])
     
+    def _compute_weight_derivatives(self, rho: float) -> np.ndarray:
+        """d(weights)/dρ for the sigmoid weighting"""
+        sech2 = 1 - np.tanh(self.params.beta * (rho - self.params.rho_0))**2
+        dw = 0.5 * self.params.beta * sech2
+        return np.array([-dw, -dw, dw])
+    
+    def _neighborhood(self, state: GASState):
+        """(neighbors, ρ_coset) of state.x, reusing the ones carried on it"""
+        if state.neighbors is None:
+            state.neighbors, state.indices = self.lattice.nearest_neighbors(
+                state.x, k=self.params.k_neighbors)
+            state.rho_coset = self._coset_density(state.x, state.indices)
+        return state.neighbors, state.rho_coset
+    
     def step(self, state: GASState) -> GASState:
         """Execute one GAS iteration"""
-        # 1. Get neighborhood
-        neighbors, indices = self.lattice.nearest_neighbors(
-            state.x, k=self.params.k_neighbors)
-        rho = self.lattice.coset_density(indices)
+        # 1. Get neighborhood (carried over from the accepted point)
+        neighbors, rho = self._neighborhood(state)
+        
+        x_prop, delta_S = self._screened_proposal(state, neighbors, rho)
+        if x_prop is None:
+            return self._transition(state, rho, accepted=False)
         
+        # Proposal is scored in its own neighborhood
+        neighbors_prop, indices_prop = self.lattice.nearest_neighbors(
+            x_prop, k=self.params.k_neighbors)
+        rho_prop = self._coset_density(x_prop, indices_prop)
+        
+        return self._metropolis(state, rho, x_prop, neighbors_prop,
+                                indices_prop, rho_prop, delta_S)
+    
+    def step_batch(self, states: List[GASState]) -> List[GASState]:
+        """Execute one GAS iteration for several independent chains
+        
+        The k-NN lookups for all proposals are one vectorized KD-tree
+        query; the per-chain update is identical to step().
+        """
+        neighborhoods = [self._neighborhood(state) for state in states]
+        rhos = [rho for _, rho in neighborhoods]
+        
+        screened = [self._screened_proposal(state, neighborhoods[i][0],
+                                            rhos[i])
+                    for i, state in enumerate(states)]
+        new_states = [self._transition(state, rhos[i], accepted=False)
+                      if screened[i][0] is None else None
+                      for i, state in enumerate(states)]
+        
+        pending = [i for i, new in enumerate(new_states) if new is None]
+        if pending:
+            X_prop = np.stack([screened[i][0] for i in pending])
+            neighbors_prop, indices_prop = self.lattice.nearest_neighbors(
+                X_prop, k=self.params.k_neighbors)
+            rhos_prop = self._coset_density(X_prop, indices_prop)
+            
+            for j, i in enumerate(pending):
+                new_states[i] = self._metropolis(
+                    states[i], rhos[i], X_prop[j], neighbors_prop[j],
+                    indices_prop[j], rhos_prop[j], screened[i][1])
+        
+        return new_states
+    
+    def _temperature(self, state: GASState, rho: float) -> float:
+        """Metropolis temperature T_t"""
+        eta_0 = self.params.eta_0 * state.temperature_scale
+        return eta_0 * np.exp(-self.params.beta * rho)
+    
+    def _propose(self, 
+                 state: GASState,
+                 neighbors: np.ndarray,
+                 rho: float) -> np.ndarray:
+        """Proposal from the neighborhood of state.x"""
         # 2. Adaptive annealing schedule
-        eta_t = self.params.eta_0 * np.exp(-self.params.gamma * rho)
-        alpha_t = self.params.alpha_0 / (1 + 0.01 * state.iteration)
-        sigma_t = self.params.sigma_0 * np.exp(-eta_t)
+        eta_0 = self.params.eta_0 * state.temperature_scale
+        eta_t = eta_0 * np.exp(-self.params.gamma * rho)
+        t = state.iteration + state.schedule_offset
+        alpha_t = self.params.alpha_0 / (1 + 0.01 * t)
+        sigma_0 = self.params.sigma_0 * state.temperature_scale
+        sigma_t = sigma_0 * np.exp(-eta_t)
         
         # 3. Compute gradient (finite difference)
-        gradient = self._compute_gradient(state.x, neighbors, rho)
+        gradient = self._compute_gradient(state.x, neighbors, rho,
+                                          state.indices)
         
         # 4. Compose update: gradient + φ-folding + noise
         x_phi = self.R_phi @ state.x
         
+        drift = -alpha_t * gradient             # Gradient descent
+        drift += eta_t * (x_phi - state.x)      # φ-folding bias
+        
         x_prop = state.x.copy()
-        x_prop += -alpha_t * gradient           # Gradient descent
-        x_prop += eta_t * (x_phi - state.x)     # φ-folding bias
-        x_prop += sigma_t * np.random.randn(8)  # Annealing noise
+        if state.proposal is not None:          # Adaptively scaled move
+            x_prop += state.proposal.move(state.x, drift, sigma_t,
+                                          state.random)
+        else:                                   # Annealing noise
+            x_prop += drift + sigma_t * state.random.randn(8)
         
         # Normalize to S⁷
-        x_prop = x_prop / np.linalg.norm(x_prop) * np.sqrt(2)
+        return x_prop / np.linalg.norm(x_prop) * np.sqrt(2)
+    
+    def _screened_proposal(self,
+                           state: GASState,
+                           neighbors: np.ndarray,
+                           rho: float):
+        """Draw one proposal and pre-screen it with the surrogate if trusted
+        
+        Returns (x_prop, delta_S) where delta_S is the surrogate's
+        predicted energy change (0 when not screening), or (None, delta_S)
+        if the proposal failed the surrogate stage and needs no exact
+        evaluation.
+        """
+        x_prop = self._propose(state, neighbors, rho)
+        if self.surrogate is None or not self.surrogate.trusted():
+            return x_prop, 0.0
+        
+        S_current, S_prop = self.surrogate.predict(np.vstack([state.x,
+                                                              x_prop]))
+        delta_S = S_prop - S_current
+        
+        # Stage 1 of delayed acceptance, on the surrogate
+        T_t = self._temperature(state, rho)
+        if delta_S > 0 and state.random.rand() >= np.exp(-delta_S / (T_t + 1e-10)):
+            return None, delta_S
         
+        return x_prop, delta_S
+    
+    def _metropolis(self,
+                    state: GASState,
+                    rho: float,
+                    x_prop: np.ndarray,
+                    neighbors_prop: np.ndarray,
+                    indices_prop: np.ndarray,
+                    rho_prop: float,
+                    delta_S: float = 0.0) -> GASState:
+        """Accept or reject x_prop; rho (of state.x) sets the temperature
+        
+        With delta_S ≠ 0 this is stage 2 of delayed acceptance (Christen &
+        Fox 2005), accepting with min(1, exp(-(ΔE - ΔS)/T)). Together with
+        stage 1, min(1, exp(-ΔS/T)) in _screened_proposal, the step keeps
+        the stationary distribution of the plain Metropolis step; surrogate
+        error costs acceptance rate, never correctness. An exact
+        improvement can therefore still be rejected if the surrogate
+        over-predicted it.
+        """
         # 5. Metropolis acceptance
         E_current = state.energy
-        E_prop = self._compute_energy(x_prop, neighbors, rho)
+        E_prop = self._compute_energy(x_prop, neighbors_prop, rho_prop,
+                                      indices_prop)
+        if self.surrogate is not None:
+            self.surrogate.update(x_prop, E_prop)
         
-        T_t = self.params.eta_0 * np.exp(-self.params.beta * rho)
+        T_t = self._temperature(state, rho)
         delta_E = E_prop - E_current
+        delta_corrected = delta_E - delta_S
         
-        accept = (delta_E <= 0 or 
-                 np.random.rand() < np.exp(-delta_E / (T_t + 1e-10)))
+        accept = (delta_corrected <= 0 or
+                  state.random.rand() < np.exp(-delta_corrected / (T_t + 1e-10)))
         
         if accept:
-            new_state = GASState(
-                x=x_prop,
-                energy=E_prop,
-                rho_coset=rho,
-                iteration=state.iteration + 1,
-                energy_history=state.energy_history + [E_prop],
-                rho_history=state.rho_history + [rho]
-            )
-        else:
-            new_state = GASState(
-                x=state.x,
-                energy=E_current,
-                rho_coset=rho,
-                iteration=state.iteration + 1,
-                energy_history=state.energy_history + [E_current],
-                rho_history=state.rho_history + [rho]
-            )
-        
-        return new_state
-    
-    def _compute_gradient(self, x, neighbors, rho):
+            return self._transition(state, rho_prop, True, x_prop, E_prop,
+                                    neighbors=neighbors_prop,
+                                    indices=indices_prop)
+        return self._transition(state, rho, False, evaluated=True)
+    
+    def _transition(self,
+                    state: GASState,
+                    rho_new: float,
+                    accepted: bool,
+                    x_new: Optional[np.ndarray] = None,
+                    E_new: Optional[float] = None,
+                    evaluated: bool = False,
+                    neighbors: Optional[np.ndarray] = None,
+                    indices: Optional[np.ndarray] = None) -> GASState:
+        """Next state after an accepted move or a rejection"""
+        if not accepted:
+            x_new, E_new = state.x, state.energy
+            neighbors, indices = state.neighbors, state.indices
+        
+        if state.proposal is not None:
+            state.proposal.update(x_new, accepted)
+        
+        return GASState(
+            x=x_new,
+            energy=E_new,
+            rho_coset=rho_new,
+            iteration=state.iteration + 1,
+            energy_history=state.energy_history + [E_new],
+            rho_history=state.rho_history + [rho_new],
+            n_accepted=state.n_accepted + int(accepted),
+            n_energy_evals=state.n_energy_evals + int(accepted or evaluated),
+            proposal=state.proposal,
+            temperature_scale=state.temperature_scale,
+            schedule_offset=state.schedule_offset,
+            rng=state.rng,
+            neighbors=neighbors,
+            indices=indices
+        )
+    
+    def _compute_gradient(self, x, neighbors, rho, indices=None):
         """Compute combined gradient from all energy terms"""
         weights = self._compute_weights(rho)
+        soft = self.params.soft_temperature is not None
         gradient = np.zeros(8)
+        values = [None] * len(self.energy_terms)
         
-        for term, weight in zip(self.energy_terms, weights):
-            gradient += weight * term.gradient(x, neighbors)
+        for i, (term, weight) in enumerate(zip(self.energy_terms, weights)):
+            # Terms that ignore x have an identically zero gradient
+            if not term.uses_position:
+                continue
+            if soft:
+                values[i], term_gradient = term.value_and_gradient(x,
+                                                                   neighbors)
+            else:
+                term_gradient = term.gradient(x, neighbors)
+            gradient += weight * term_gradient
+        
+        # With a smooth ρ_coset the weights depend on x as well:
+        # Σₜ termₜ · dwₜ/dρ · ∇ρ
+        if soft:
+            for i, value in self._static_values(neighbors, indices).items():
+                values[i] = value
+            dweights = self._compute_weight_derivatives(rho)
+            drho = self.lattice.soft_coset_density_gradient(
+                x, self.params.soft_temperature)
+            gradient += np.dot(dweights, values) * drho
         
         return gradient
     
-    def optimize(self, 
-                 x_init: Optional[np.ndarray] = None,
-                 callback: Optional[Callable] = None) -> GASState:
-        """Run full GAS optimization"""
+    def initial_state(self, 
+                      x_init: Optional[np.ndarray] = None,
+                      temperature_scale: float = 1.0,
+                      rng: Optional[np.random.RandomState] = None,
+                      schedule_offset: int = 0) -> GASState:
+        """Build the iteration-0 state (random point on S⁷ if x_init is None)
+        
+        temperature_scale < 1 runs the chain cooler (lower eta_0, and so
+        lower temperature, and proportionally less noise), for refining
+        a warm start instead of exploring from eta_0.
+        rng gives the chain its own random stream, so it is reproducible
+        regardless of other chains or threads.
+        schedule_offset resumes the step-size schedule alpha_t of an
+        earlier run that already took that many iterations.
+        """
         if x_init is None:
-            x_init = np.random.randn(8)
+            x_init = (np.random if rng is None else rng).randn(8)
             x_init = x_init / np.linalg.norm(x_init) * np.sqrt(2)
         
-        neighbors, indices = self.lattice.nearest_neighbors(x_init)
-        rho_init = self.lattice.coset_density(indices)
-        E_init = self._compute_energy(x_init, neighbors, rho_init)
+        neighbors, indices = self.lattice.nearest_neighbors(
+            x_init, k=self.params.k_neighbors)
+        rho_init = self._coset_density(x_init, indices)
+        E_init = self._compute_energy(x_init, neighbors, rho_init, indices)
+        if self.surrogate is not None:
+            self.surrogate.update(x_init, E_init)
+        
+        proposal = None
+        if self.params.adaptive_proposal:
+            proposal = AdaptiveProposal(self.params.target_accept,
+                                        self.params.adapt_covariance)
         
-        state = GASState(
+        return GASState(
             x=x_init,
             energy=E_init,
             rho_coset=rho_init,
             iteration=0,
             energy_history=[E_init],
-            rho_history=[rho_init]
+            rho_history=[rho_init],
+            n_energy_evals=1,
+            proposal=proposal,
+            temperature_scale=temperature_scale,
+            schedule_offset=schedule_offset,
+            rng=rng,
+            neighbors=neighbors,
+            indices=indices
         )
+    
+    def is_converged(self, state: GASState) -> bool:
+        """Energy stable over the last 50 steps and coset density sufficient"""
+        # Warm-up: the check only starts once 51 steps have been taken
+        if state.iteration <= 51:
+            return False
         
-        for t in range(self.params.max_iters):
+        recent_energies = state.energy_history[-50:]
+        energy_stable = (np.std(recent_energies) / 
+                       (np.mean(recent_energies) + 1e-10) 
+                       < self.params.tau_E)
+        
+        coset_sufficient = state.rho_coset > self.params.rho_min
+        
+        return energy_stable and coset_sufficient
+    
+    def advance(self, 
+                state: GASState,
+                n_iters: int,
+                callback: Optional[Callable] = None) -> GASState:
+        """Run up to n_iters steps from state, stopping early on convergence"""
+        for _ in range(n_iters):
+            if state.converged:
+                break
+            
             state = self.step(state)
             
             if callback:
                 callback(state)
             
-            # Check convergence
-            if t > 50:
-                recent_energies = state.energy_history[-50:]
-                energy_stable = (np.std(recent_energies) / 
-                               (np.mean(recent_energies) + 1e-10) 
-                               < self.params.tau_E)
-                
-                coset_sufficient = state.rho_coset > self.params.rho_min
-                
-                if energy_stable and coset_sufficient:
-                    state.converged = True
-                    break
+            if self.is_converged(state):
+                state.converged = True
         
         return state
+    
+    def optimize(self, 
+                 x_init: Optional[np.ndarray] = None,
+                 callback: Optional[Callable] = None,
+                 temperature_scale: float = 1.0,
+                 max_iters: Optional[int] = None,
+                 rng: Optional[np.random.RandomState] = None) -> GASState:
+        """Run full GAS optimization"""
+        if max_iters is None:
+            max_iters = self.params.max_iters
+        state = self.initial_state(x_init, temperature_scale, rng)
+        return self.advance(state, max_iters, callback)
+    
+    def optimize_batch(self,
+                       x_inits: np.ndarray,
+                       max_iters: Optional[int] = None,
+                       stop: Optional[Callable[[int, GASState], bool]] = None,
+                       temperature_scale: float = 1.0,
+                       rngs: Optional[List[np.random.RandomState]] = None,
+                       on_done: Optional[Callable[[int, GASState], None]] = None,
+                       schedule_offset: int = 0) -> List[GASState]:
+        """Run independent GAS chains in lockstep, one per row of x_inits
+        
+        Each chain stops on its own convergence, or when stop(i, state)
+        returns True (used for per-chain budgets, deadlines, cancellation).
+        rngs optionally gives each chain its own random stream.
+        on_done(i, state) is called once per chain as soon as it stops,
+        so callers need not wait for the slowest chain of the batch.
+        temperature_scale and schedule_offset are as in initial_state().
+        """
+        if max_iters is None:
+            max_iters = self.params.max_iters
+        
+        x_inits = np.atleast_2d(x_inits)
+        if rngs is None:
+            rngs = [None] * len(x_inits)
+        states = [self.initial_state(x, temperature_scale, rng,
+                                     schedule_offset)
+                  for x, rng in zip(x_inits, rngs)]
+        active = list(range(len(states)))
+        
+        def retire(done: List[int]):
+            if on_done is not None:
+                for i in done:
+                    on_done(i, states[i])
+        
+        for _ in range(max_iters):
+            if stop is not None:
+                stopped = [i for i in active if stop(i, states[i])]
+                active = [i for i in active if i not in stopped]
+                retire(stopped)
+            if not active:
+                break
+            
+            stepped = self.step_batch([states[i] for i in active])
+            for i, state in zip(active, stepped):
+                if self.is_converged(state):
+                    state.converged = True
+                states[i] = state
+            
+            retire([i for i in active if states[i].converged])
+            active = [i for i in active if not states[i].converged]
+        
+        retire(active)
+        return states
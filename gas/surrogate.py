@@ -0,0 +1,98 @@
+"""
+Surrogate Energy Model for Proposal Screening
+
+A cheap online regression of the total GAS energy, used to pre-screen
+each proposal before the exact _compute_energy (delayed acceptance,
+Christen & Fox 2005).
+
+Points are canonicalized under W(D₈) ⊂ W(E₈) (coordinate permutations
+and even sign changes). The 240 roots are invariant under this group,
+and so are the k-NN sets up to relabeling, ρ_coset and every energy
+term, so the canonical form loses no information the energy sees.
+"""
+import threading
+import numpy as np
+
+
+def canonicalize(X: np.ndarray) -> np.ndarray:
+    """W(D₈) canonical form: |x| sorted descending, sign parity on the last"""
+    X = np.atleast_2d(X)
+    C = -np.sort(-np.abs(X), axis=1)
+    parity = np.prod(np.where(X < 0, -1.0, 1.0), axis=1)
+    C[:, -1] *= parity
+    return C
+
+
+def quadratic_features(C: np.ndarray) -> np.ndarray:
+    """[1, c, cᵢcⱼ (i ≤ j)] — 45 features for 8-dimensional c"""
+    i, j = np.triu_indices(C.shape[1])
+    return np.hstack([np.ones((len(C), 1)), C, C[:, i] * C[:, j]])
+
+
+class SurrogateModel:
+    """Online ridge regression over canonical quadratic features
+
+    forgetting < 1 discounts old samples, since the energy weights drift
+    with ρ over an annealing run. The model reports itself trusted only
+    after min_points samples and while its running error stays below
+    max_error_ratio times the running spread of the energies.
+    All methods are thread-safe: one model may be shared by solver
+    calls running in different executor threads.
+    """
+
+    def __init__(self,
+                 ridge: float = 1e-3,
+                 forgetting: float = 0.995,
+                 min_points: int = 50,
+                 max_error_ratio: float = 0.5,
+                 smoothing: float = 0.05):
+        self.ridge = ridge
+        self.forgetting = forgetting
+        self.min_points = min_points
+        self.max_error_ratio = max_error_ratio
+        self.smoothing = smoothing
+
+        n_features = 45
+        self.A = np.zeros((n_features, n_features))
+        self.b = np.zeros(n_features)
+        self.n = 0
+        self._coef = np.zeros(n_features)
+        self._dirty = False
+
+        self.energy_mean = 0.0
+        self.spread = 0.0
+        self.error = 0.0
+        self._lock = threading.RLock()
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicted energies for each row of X"""
+        features = quadratic_features(canonicalize(X))
+        with self._lock:
+            if self._dirty:
+                A = self.A + self.ridge * np.eye(len(self.A))
+                self._coef = np.linalg.solve(A, self.b)
+                self._dirty = False
+            coef = self._coef
+        return features @ coef
+
+    def update(self, x: np.ndarray, energy: float):
+        """Add one exactly evaluated point"""
+        phi = quadratic_features(canonicalize(x))[0]
+        with self._lock:
+            if self.n >= self.min_points:
+                residual = abs(self.predict(x)[0] - energy)
+                self.error += self.smoothing * (residual - self.error)
+
+            a = 1.0 if self.n == 0 else self.smoothing
+            self.energy_mean += a * (energy - self.energy_mean)
+            self.spread += a * (abs(energy - self.energy_mean) - self.spread)
+
+            self.A = self.forgetting * self.A + np.outer(phi, phi)
+            self.b = self.forgetting * self.b + energy * phi
+            self.n += 1
+            self._dirty = True
+
+    def trusted(self) -> bool:
+        with self._lock:
+            return (self.n >= self.min_points and
+                    self.error <= self.max_error_ratio * self.spread)
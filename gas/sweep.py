@@ -0,0 +1,277 @@
+"""
+Hyperparameter Sweep Engine for GAS (Successive Halving)
+
+Runs many GASParams configurations in parallel and prunes poor ones
+early: every rung advances the surviving trials to a larger iteration
+budget, scores them on intermediate energy and ρ_coset, and keeps the
+best 1/eta of them for the next rung.
+"""
+import json
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .energy_terms import EnergyTerm
+from .solver import GeometricAnnealingSolver, GASParams, GASState
+
+
+@dataclass
+class SearchSpace:
+    """Search space over GASParams fields
+
+    choices: discrete values per parameter
+    ranges:  (low, high) per parameter, sampled uniformly
+    log_scale: names in `ranges` to sample log-uniformly instead
+    """
+    choices: Dict[str, Sequence[Any]] = field(default_factory=dict)
+    ranges: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    log_scale: Sequence[str] = ()
+
+    def __post_init__(self):
+        valid = {f.name for f in fields(GASParams)}
+        for name in list(self.choices) + list(self.ranges):
+            if name not in valid:
+                raise ValueError(f"Unknown GASParams field: {name!r}")
+        for name in self.log_scale:
+            if name not in self.ranges:
+                raise ValueError(f"log_scale entry {name!r} has no range")
+            if min(self.ranges[name]) <= 0:
+                raise ValueError(f"log_scale range for {name!r} must be > 0")
+
+    def sample(self, n: int, rng: np.random.Generator) -> List[Dict[str, Any]]:
+        """Draw n independent configurations (as GASParams overrides)"""
+        configs = []
+        for _ in range(n):
+            config = {}
+            for name, values in self.choices.items():
+                config[name] = values[rng.integers(len(values))]
+            for name, (low, high) in self.ranges.items():
+                if name in self.log_scale:
+                    config[name] = float(np.exp(
+                        rng.uniform(np.log(low), np.log(high))))
+                else:
+                    config[name] = float(rng.uniform(low, high))
+            configs.append(config)
+        return configs
+
+
+@dataclass
+class Trial:
+    """One configuration tracked through the sweep"""
+    trial_id: int
+    overrides: Dict[str, Any]
+    params: GASParams
+    seed: int
+    state: Optional[GASState] = None
+    rung: int = 0
+    budget: int = 0             # iterations the trial was last advanced to
+    score: float = np.inf
+    status: str = "pending"     # pending | running | pruned | completed
+
+
+class TrialStore:
+    """Append-only JSON-lines record of every trial evaluation
+
+    Each rung writes a "running" record per trial; a trial's final
+    "pruned" or "completed" status is written as a further record, so
+    the last record of a trial_id is its current status.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, trial: Trial):
+        state = trial.state
+        record = {
+            "trial_id": trial.trial_id,
+            "overrides": trial.overrides,
+            "seed": trial.seed,
+            "rung": trial.rung,
+            "budget": trial.budget,
+            "status": trial.status,
+            "score": float(trial.score),
+            "iteration": int(state.iteration),
+            "energy": float(state.energy),
+            "rho_coset": float(state.rho_coset),
+            "converged": bool(state.converged),
+            "acceptance_rate": float(state.acceptance_rate),
+            "n_energy_evals": int(state.n_energy_evals),
+            "x": [float(v) for v in state.x],
+            "timestamp": time.time(),
+        }
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record) + "\n")
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+
+
+def _advance_trial(lattice: 'E8Lattice',
+                   energy_terms: List[EnergyTerm],
+                   params: GASParams,
+                   state: Optional[GASState],
+                   seed: int,
+                   budget: int) -> GASState:
+    """Worker: advance one trial to `budget` total iterations
+
+    Each rung builds a fresh solver, so the solver-owned state (the
+    neighborhood energy cache and any surrogate_screening model) does
+    not carry over between rungs; the adaptive proposal lives on the
+    GASState and does. This keeps a trial's trajectory independent of
+    which worker (or how many workers) ran its previous rungs.
+    """
+    solver = GeometricAnnealingSolver(lattice, energy_terms, params)
+
+    # A fresh RandomState per trial and rung, for the same reason; the
+    # global np.random stream of the caller is left untouched
+    start = 0 if state is None else state.iteration
+    rng = np.random.RandomState((seed * 1_000_003 + start) % (2**32))
+
+    if state is None:
+        state = solver.initial_state(rng=rng)
+    else:
+        state = replace(state, rng=rng)
+
+    return solver.advance(state, budget - state.iteration)
+
+
+class SuccessiveHalvingSweep:
+    """Parallel hyperparameter sweep with successive-halving pruning"""
+
+    def __init__(self,
+                 lattice: 'E8Lattice',
+                 energy_terms: List[EnergyTerm],
+                 space: SearchSpace,
+                 base_params: Optional[GASParams] = None,
+                 n_configs: int = 27,
+                 min_iters: int = 50,
+                 eta: int = 3,
+                 rho_penalty: float = 1.0,
+                 n_workers: Optional[int] = None,
+                 store_path: Optional[str] = None,
+                 seed: int = 0):
+        if eta < 2:
+            raise ValueError("eta must be >= 2")
+        self.lattice = lattice
+        self.energy_terms = energy_terms
+        self.space = space
+        self.base_params = base_params or GASParams()
+        self.n_configs = n_configs
+        self.min_iters = min_iters
+        self.eta = eta
+        self.rho_penalty = rho_penalty
+        self.n_workers = n_workers
+        self.store = TrialStore(store_path) if store_path else None
+        self.rng = np.random.default_rng(seed)
+
+    def budgets(self, max_iters: Optional[int] = None) -> List[int]:
+        """Iteration budget per rung: min_iters·eta^r, capped at max_iters
+
+        max_iters defaults to base_params.max_iters; each trial is
+        further capped at its own params.max_iters.
+        """
+        if max_iters is None:
+            max_iters = self.base_params.max_iters
+        budgets = []
+        budget = self.min_iters
+        while budget < max_iters:
+            budgets.append(budget)
+            budget *= self.eta
+        budgets.append(max_iters)
+        return budgets
+
+    def score(self, state: GASState, params: GASParams) -> float:
+        """Lower is better: energy plus a penalty for ρ below rho_min"""
+        shortfall = max(0.0, params.rho_min - state.rho_coset)
+        return float(state.energy + self.rho_penalty * shortfall)
+
+    def run(self) -> List[Trial]:
+        """Run the sweep; returns all trials sorted best-first"""
+        trials = []
+        for i, overrides in enumerate(self.space.sample(self.n_configs,
+                                                        self.rng)):
+            trials.append(Trial(
+                trial_id=i,
+                overrides=overrides,
+                params=replace(self.base_params, **overrides),
+                seed=int(self.rng.integers(2**31))
+            ))
+
+        budgets = self.budgets(max(t.params.max_iters for t in trials))
+        active = list(trials)
+
+        executor = None
+        if self.n_workers is None or self.n_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.n_workers)
+
+        try:
+            for rung, budget in enumerate(budgets):
+                self._run_rung(active, rung, budget, executor)
+
+                # Converged trials, and trials at their own max_iters,
+                # cannot improve further; finalize them
+                running = []
+                for t in active:
+                    if self._finished(t):
+                        self._set_status(t, "completed")
+                    else:
+                        running.append(t)
+
+                if rung == len(budgets) - 1:
+                    for t in running:
+                        self._set_status(t, "completed")
+                    break
+
+                n_keep = max(1, int(np.ceil(len(running) / self.eta)))
+                running.sort(key=lambda t: t.score)
+                for t in running[n_keep:]:
+                    self._set_status(t, "pruned")
+                active = running[:n_keep]
+                if not active:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return sorted(trials, key=lambda t: t.score)
+
+    @staticmethod
+    def _finished(trial: Trial) -> bool:
+        return (trial.state.converged or
+                trial.state.iteration >= trial.params.max_iters)
+
+    def _set_status(self, trial: Trial, status: str):
+        trial.status = status
+        if self.store is not None:
+            self.store.append(trial)
+
+    def _run_rung(self,
+                  active: List[Trial],
+                  rung: int,
+                  budget: int,
+                  executor: Optional[ProcessPoolExecutor]):
+        # A trial never runs past its own max_iters (it may be searched)
+        budgets = [min(budget, t.params.max_iters) for t in active]
+        args = [(self.lattice, self.energy_terms, t.params, t.state,
+                 t.seed, b) for t, b in zip(active, budgets)]
+
+        if executor is None:
+            states = [_advance_trial(*a) for a in args]
+        else:
+            futures = [executor.submit(_advance_trial, *a) for a in args]
+            states = [f.result() for f in futures]
+
+        for trial, state, trial_budget in zip(active, states, budgets):
+            trial.state = state
+            trial.rung = rung
+            trial.budget = trial_budget
+            trial.score = self.score(state, trial.params)
+            self._set_status(trial, "running")
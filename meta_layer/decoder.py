@@ -3,7 +3,11 @@ Proximal-Geometric Descent (PGD) Inverse Solver
 Decodes E₈ state back to N-dimensional actionable space
 """
 import numpy as np
+from scipy.linalg import cho_factor, cho_solve
 from scipy.optimize import minimize
+from typing import List, Optional, Callable
+
+from gas.energy_terms import EnergyTerm
 
 class ProximalGeometricDecoder:
     """8→N inverse mapping with geometric regularization"""
@@ -15,24 +19,40 @@ class ProximalGeometricDecoder:
                  lambda_1: float = 0.01,  # L1 sparsity
                  lambda_2: float = 0.1,   # Cost model
                  lambda_3: float = 1.0):  # Geometric coherence
-        self.W = W  # (N, 8) projection matrix
+        self.set_W(W)
         self.lattice = lattice
         self.energy_terms = energy_terms
         self.lambda_1 = lambda_1
         self.lambda_2 = lambda_2
         self.lambda_3 = lambda_3
     
+    def set_W(self, W: np.ndarray):
+        """Replace the projection matrix
+        
+        WᵀW is refactored lazily, only when a decode actually needs the
+        least-squares start (i.e. no warm y_init is given).
+        """
+        self.W = W  # (N, 8) projection matrix
+        self._WtW_factor = None
+    
     def decode(self, x_star: np.ndarray, 
                cost_model: Optional[Callable] = None,
-               max_iters: int = 500) -> np.ndarray:
+               max_iters: int = 500,
+               y_init: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Solve: min ||W^T y - x*||² + λ₁||y||₁ + λ₂·Cost(y) + λ₃·R_geo(y)
+        
+        y_init: warm start (e.g. the previous solution); defaults to the
+        least-squares solution.
         """
         N = self.W.shape[0]
         
         # Warm start: least squares solution
-        WtW = self.W.T @ self.W
-        y_init = self.W @ np.linalg.solve(WtW + 1e-6*np.eye(8), x_star)
+        if y_init is None:
+            if self._WtW_factor is None:
+                WtW = self.W.T @ self.W
+                self._WtW_factor = cho_factor(WtW + 1e-6*np.eye(8))
+            y_init = self.W @ cho_solve(self._WtW_factor, x_star)
         
         def objective(y):
             # Fidelity term
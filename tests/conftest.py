@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The repository root is not an installable package layout; make
+# `gas` and `meta_layer` importable for the tests.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
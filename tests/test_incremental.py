@@ -0,0 +1,41 @@
+"""
+Tests for warm-started incremental re-optimization
+"""
+import numpy as np
+
+from gas.lattice import E8Lattice
+from gas.energy_terms import OctahedralEnergy, TetrahedralEnergy, GoldenEnergy
+from gas.solver import GeometricAnnealingSolver, GASParams
+from gas.incremental import IncrementalSolver
+
+
+def _incremental(seed):
+    lattice = E8Lattice()
+    terms = [OctahedralEnergy(), TetrahedralEnergy(), GoldenEnergy()]
+    solver = GeometricAnnealingSolver(lattice, terms,
+                                      GASParams(max_iters=100, rho_min=2.0))
+    return IncrementalSolver(solver, refine_iters=30, seed=seed)
+
+
+def test_warm_solves_are_reproducible_and_leave_global_rng_alone():
+    np.random.seed(5)
+    expected = np.random.rand(3)
+
+    np.random.seed(5)
+    runs = []
+    for _ in range(2):
+        incremental = _incremental(seed=11)
+        runs.append([incremental.solve().state.x for _ in range(3)])
+    assert np.random.rand(3).tolist() == expected.tolist()
+    for a, b in zip(*runs):
+        assert np.array_equal(a, b)
+
+
+def test_warm_solve_resumes_the_step_size_schedule():
+    incremental = _incremental(seed=0)
+    cold = incremental.solve()
+    warm = incremental.solve()
+    assert warm.warm
+    assert warm.state.schedule_offset == cold.state.iteration
+    assert incremental.schedule_offset == (cold.state.iteration +
+                                           warm.state.iteration)
@@ -0,0 +1,125 @@
+"""
+Tests for the asyncio optimization service
+"""
+import asyncio
+import time
+import numpy as np
+import pytest
+
+from gas.lattice import E8Lattice
+from gas.energy_terms import OctahedralEnergy, TetrahedralEnergy, GoldenEnergy
+from gas.solver import GASParams
+from gas.service import OptimizationService
+
+
+@pytest.fixture(scope="module")
+def lattice():
+    return E8Lattice()
+
+
+def _service(lattice, **kwargs):
+    terms = [OctahedralEnergy(), TetrahedralEnergy(), GoldenEnergy()]
+    # rho_min > 1 can never be met, so chains run their full budget
+    params = GASParams(max_iters=100, rho_min=2.0)
+    return OptimizationService(lattice, terms, params, **kwargs)
+
+
+def _run(service, coro):
+    async def main():
+        try:
+            return await coro(service)
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+
+def test_requests_in_one_window_are_coalesced(lattice):
+    async def scenario(service):
+        return await asyncio.gather(*(
+            service.submit("optimize", {"seed": i, "max_iters": 20})
+            for i in range(5)))
+
+    service = _service(lattice, batch_window=0.05)
+    results = _run(service, scenario)
+    assert [r["iteration"] for r in results] == [20] * 5
+    assert service.report()["batches"] == 1
+    assert service.report()["mean_batch_size"] == 5
+
+
+def test_short_request_is_not_held_by_a_long_one(lattice):
+    W = np.random.RandomState(0).randn(12, 8)
+
+    async def scenario(service):
+        done = {}
+
+        async def timed(name, op, payload):
+            await service.submit(op, payload)
+            done[name] = time.monotonic()
+
+        start = time.monotonic()
+        await asyncio.gather(
+            timed("long", "optimize", {"seed": 0, "max_iters": 3000}),
+            timed("short", "optimize", {"seed": 1, "max_iters": 5}),
+            timed("decode", "decode", {"W": W.tolist(), "x": [0.5] * 8,
+                                       "max_iters": 5}))
+        return {name: t - start for name, t in done.items()}
+
+    service = _service(lattice, batch_window=0.05)
+    elapsed = _run(service, scenario)
+    assert service.report()["batches"] == 1
+    assert elapsed["short"] < elapsed["long"] / 4
+    # The decode shares the GIL with the long chain but never waits on it
+    assert elapsed["decode"] < elapsed["long"] / 2
+
+
+def test_deadline_raises_and_stops_the_chain(lattice):
+    async def scenario(service):
+        with pytest.raises(asyncio.TimeoutError):
+            await service.submit("optimize", {"seed": 0, "max_iters": 10**6},
+                                 deadline=0.2)
+        start = time.monotonic()
+        while service._batch_tasks:
+            await asyncio.sleep(0.01)
+        return time.monotonic() - start
+
+    service = _service(lattice)
+    assert _run(service, scenario) < 1.0
+    assert service.report()["timed_out"] == 1
+
+
+def test_cancelled_request_leaves_its_batch(lattice):
+    async def scenario(service):
+        doomed = asyncio.ensure_future(
+            service.submit("optimize", {"seed": 0, "max_iters": 10**6}))
+        other = asyncio.ensure_future(
+            service.submit("optimize", {"seed": 1, "max_iters": 10}))
+        result = await other
+        doomed.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await doomed
+        start = time.monotonic()
+        while service._batch_tasks:
+            await asyncio.sleep(0.01)
+        return result, time.monotonic() - start
+
+    service = _service(lattice, batch_window=0.05)
+    result, drain_time = _run(service, scenario)
+    assert result["iteration"] == 10
+    assert drain_time < 1.0
+    assert service.report()["cancelled"] == 1
+
+
+def test_invalid_request_fails_alone(lattice):
+    async def scenario(service):
+        return await asyncio.gather(
+            service.submit("optimize", {"x_init": [1, 2, 3]}),
+            service.submit("optimize", {"seed": "x"}),
+            service.submit("optimize", {"seed": 2, "max_iters": 10}),
+            return_exceptions=True)
+
+    service = _service(lattice, batch_window=0.05)
+    bad_x, bad_seed, good = _run(service, scenario)
+    assert isinstance(bad_x, ValueError)
+    assert isinstance(bad_seed, ValueError)
+    assert good["iteration"] == 10
+    assert service.report()["batches"] == 1
@@ -0,0 +1,75 @@
+"""
+Tests for the GAS solver loop
+"""
+import numpy as np
+import pytest
+
+from gas.lattice import E8Lattice
+from gas.energy_terms import (OctahedralEnergy, TetrahedralEnergy,
+                              GoldenEnergy, create_soft_energy_suite)
+from gas.proposal import AdaptiveProposal
+from gas.solver import GeometricAnnealingSolver, GASParams
+
+
+def _solver(**params):
+    lattice = E8Lattice()
+    terms = [OctahedralEnergy(), TetrahedralEnergy(), GoldenEnergy()]
+    return GeometricAnnealingSolver(lattice, terms, GASParams(**params))
+
+
+def test_step_queries_only_the_proposal_neighborhood():
+    solver = _solver()
+    state = solver.initial_state(rng=np.random.RandomState(0))
+
+    queried = []
+    query = solver.lattice.nearest_neighbors
+
+    def counting(x, k=24):
+        queried.append(np.array(x))
+        return query(x, k)
+
+    solver.lattice.nearest_neighbors = counting
+    for _ in range(20):
+        x_before = state.x
+        state = solver.step(state)
+        assert not np.array_equal(queried[-1], x_before)
+    assert len(queried) == 20
+
+
+def test_carried_neighborhood_matches_a_fresh_query():
+    solver = _solver()
+    state = solver.advance(solver.initial_state(rng=np.random.RandomState(1)),
+                           50)
+    neighbors, indices = solver.lattice.nearest_neighbors(state.x, k=24)
+    assert np.array_equal(state.indices, indices)
+    assert np.isclose(state.rho_coset,
+                      solver._coset_density(state.x, indices))
+
+
+def test_adaptive_scale_acts_on_the_drift():
+    proposal = AdaptiveProposal()
+    proposal.log_scale = np.log(0.5)
+    x = np.full(8, 0.5)
+    drift = np.array([1.0, -1.0, 0, 0, 0, 0, 0, 0])
+    move = proposal.move(x, drift, sigma_t=0.0)
+    assert np.allclose(move, 0.5 * drift)
+
+
+def test_soft_terms_must_share_the_solver_kernel():
+    lattice = E8Lattice()
+    terms = create_soft_energy_suite(lattice, temperature=0.5, k=24)
+    GeometricAnnealingSolver(lattice, terms, GASParams(soft_temperature=0.5))
+    for params in (GASParams(),
+                   GASParams(soft_temperature=0.3),
+                   GASParams(soft_temperature=0.5, k_neighbors=16)):
+        with pytest.raises(ValueError):
+            GeometricAnnealingSolver(lattice, terms, params)
+
+
+def test_soft_value_and_gradient_match_compute_and_gradient():
+    lattice = E8Lattice()
+    x = np.random.RandomState(0).randn(8)
+    for term in create_soft_energy_suite(lattice):
+        value, gradient = term.value_and_gradient(x, None)
+        assert value == term.compute(x, None)
+        assert np.allclose(gradient, term.gradient(x, None))
@@ -0,0 +1,103 @@
+"""
+Tests for surrogate-assisted proposal screening
+"""
+import threading
+import numpy as np
+
+from gas.lattice import E8Lattice
+from gas.energy_terms import OctahedralEnergy, TetrahedralEnergy, GoldenEnergy
+from gas.solver import GeometricAnnealingSolver, GASParams
+from gas.surrogate import SurrogateModel
+
+
+def _solver(**params):
+    lattice = E8Lattice()
+    terms = [OctahedralEnergy(), TetrahedralEnergy(), GoldenEnergy()]
+    return GeometricAnnealingSolver(lattice, terms, GASParams(**params))
+
+
+def _exact_energy(solver, x):
+    neighbors, indices = solver.lattice.nearest_neighbors(
+        x, k=solver.params.k_neighbors)
+    rho = solver._coset_density(x, indices)
+    return solver._compute_energy(x, neighbors, rho, indices)
+
+
+class _StubSurrogate:
+    """Always trusted; predicts the exact energy plus `bias(x)`"""
+
+    def __init__(self, solver, bias=lambda x: 0.0):
+        self.solver = solver
+        self.bias = bias
+
+    def predict(self, X):
+        return np.array([_exact_energy(self.solver, x) + self.bias(x)
+                         for x in X])
+
+    def update(self, x, energy):
+        pass
+
+    def trusted(self):
+        return True
+
+
+def test_exact_surrogate_screening_matches_plain_gas_with_fewer_evals():
+    plain = _solver()
+    screened = _solver(surrogate_screening=True)
+    screened.surrogate = _StubSurrogate(screened)
+
+    x_init = np.full(8, 0.5)
+    a = plain.initial_state(x_init, rng=np.random.RandomState(0))
+    b = screened.initial_state(x_init, rng=np.random.RandomState(0))
+    for _ in range(100):
+        a, b = plain.step(a), screened.step(b)
+        assert np.array_equal(a.x, b.x)
+    assert b.n_energy_evals < a.n_energy_evals
+
+
+def test_optimistic_surrogate_does_not_force_exact_improvements(monkeypatch):
+    solver = _solver(surrogate_screening=True)
+    rng = np.random.RandomState(0)
+    state = solver.initial_state(np.full(8, 0.5))    # a coset root, on S⁷
+
+    # An exact improvement, whose predicted drop is larger by T·ln 2
+    while True:
+        x_prop = rng.randn(8)
+        x_prop = x_prop / np.linalg.norm(x_prop) * np.sqrt(2)
+        delta_E = _exact_energy(solver, x_prop) - state.energy
+        if delta_E < 0:
+            break
+    T = solver._temperature(state, state.rho_coset)
+    bias = -T * np.log(2)
+    solver.surrogate = _StubSurrogate(
+        solver, lambda x: bias if np.array_equal(x, x_prop) else 0.0)
+    monkeypatch.setattr(solver, "_propose", lambda *args: x_prop)
+
+    # Delayed acceptance: stage 1 always passes, stage 2 with exp(-ln 2)
+    n = 2000
+    accepted = 0
+    for seed in range(n):
+        state.rng = np.random.RandomState(seed)
+        accepted += solver.step(state).n_accepted - state.n_accepted
+    assert abs(accepted / n - 0.5) < 0.05
+
+
+def test_surrogate_concurrent_updates_are_counted():
+    model = SurrogateModel(min_points=10)
+    rng = np.random.RandomState(0)
+    X = rng.randn(4, 200, 8)
+
+    def worker(points):
+        for x in points:
+            model.update(x, float(np.sum(x**2)))
+            model.predict(points[:3])
+
+    threads = [threading.Thread(target=worker, args=(X[i],))
+               for i in range(len(X))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert model.n == X.shape[0] * X.shape[1]
+    assert np.all(np.isfinite(model.predict(X[0])))
@@ -0,0 +1,35 @@
+"""
+Tests for the successive-halving sweep
+"""
+import numpy as np
+
+from gas.lattice import E8Lattice
+from gas.energy_terms import OctahedralEnergy, TetrahedralEnergy, GoldenEnergy
+from gas.solver import GASParams
+from gas.sweep import SearchSpace, SuccessiveHalvingSweep
+
+
+def _sweep(n_workers):
+    lattice = E8Lattice()
+    terms = [OctahedralEnergy(), TetrahedralEnergy(), GoldenEnergy()]
+    space = SearchSpace(choices={"gamma": [1.0, 2.0, 4.0]})
+    return SuccessiveHalvingSweep(lattice, terms, space,
+                                  GASParams(max_iters=60),
+                                  n_configs=4, min_iters=20,
+                                  n_workers=n_workers, seed=3)
+
+
+def test_in_process_sweep_leaves_global_rng_untouched():
+    np.random.seed(123)
+    expected = np.random.rand(5)
+
+    np.random.seed(123)
+    _sweep(n_workers=1).run()
+    assert np.array_equal(np.random.rand(5), expected)
+
+
+def test_sweep_does_not_depend_on_worker_count():
+    serial = _sweep(n_workers=1).run()
+    parallel = _sweep(n_workers=2).run()
+    assert ([(t.trial_id, t.status, t.state.energy) for t in serial] ==
+            [(t.trial_id, t.status, t.state.energy) for t in parallel])